@@ -76,6 +76,11 @@ __all__ = [
 ]
 
 
+# Constant data used for 'None' blocks in lifting. Shared since it has
+# no entries to modify.
+_empty_constants = np.empty(0, dtype=PETSc.ScalarType)
+
+
 def _extract_function_spaces(
     a: Iterable[Iterable[Form]],
 ) -> tuple[Sequence[_FunctionSpace], Sequence[_FunctionSpace]]:
@@ -84,28 +89,51 @@ def _extract_function_spaces(
     """
     assert len({len(cols) for cols in a}) == 1, "Array of function spaces is not rectangular"
 
-    # Extract (V0, V1) pair for each block in 'a'
-    def fn(form):
-        return form.function_spaces if form is not None else None
+    # Compute spaces for each row/column block in a single pass over 'a'
+    rows: list[typing.Optional[_FunctionSpace]] = [None] * len(a)
+    cols: list[typing.Optional[_FunctionSpace]] = [None] * len(a[0])
+    for i, a_row in enumerate(a):
+        for j, form in enumerate(a_row):
+            if form is not None:
+                V0, V1 = form.function_spaces
+                if rows[i] is None:
+                    rows[i] = V0
+                else:
+                    assert rows[i] == V0, "Block row has more than one test space"
+                if cols[j] is None:
+                    cols[j] = V1
+                else:
+                    assert cols[j] == V1, "Block column has more than one trial space"
 
-    from functools import partial
+    assert all(V is not None for V in rows)
+    assert all(V is not None for V in cols)
+    return rows, cols
 
-    Vblock: typing.Iterable = map(partial(map, fn), a)
 
-    # Compute spaces for each row/column block
-    rows: Sequence[set] = [set() for i in range(len(a))]
-    cols: Sequence[set] = [set() for i in range(len(a[0]))]
-    for i, Vrow in enumerate(Vblock):
-        for j, V in enumerate(Vrow):
-            if V is not None:
-                rows[i].add(V[0])
-                cols[j].add(V[1])
+def _index_map_and_bs(V: _FunctionSpace) -> tuple[_cpp.common.IndexMap, int]:
+    """Return the index map and the index map block size of the
+    (first) dofmap of a function space.
+    """
+    dofmap = V.dofmaps(0)
+    return dofmap.index_map, dofmap.index_map_bs
 
-    rows = [e for row in rows for e in row]
-    cols = [e for col in cols for e in col]
-    assert len(rows) == len(a)
-    assert len(cols) == len(a[0])
-    return rows, cols
+
+def _block_offsets(
+    maps: Sequence[tuple[_cpp.common.IndexMap, int]],
+) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Compute the local offsets of the owned and of the ghost entries
+    of each block in a blocked vector with layout ``b = [b_0, b_1, ...,
+    b_n, b_0g, b_1g, ..., b_ng]``.
+    """
+    off_owned = tuple(
+        itertools.accumulate(maps, lambda off, m: off + m[0].size_local * m[1], initial=0)
+    )
+    off_ghost = tuple(
+        itertools.accumulate(
+            maps, lambda off, m: off + m[0].num_ghosts * m[1], initial=off_owned[-1]
+        )
+    )
+    return off_owned, off_ghost
 
 
 # -- Vector instantiation -------------------------------------------------
@@ -158,38 +186,22 @@ def create_vector(
         A PETSc vector with a layout that is compatible with ``L``. The
         vector is not initialised to zero.
     """
-    try:
-        dofmap = L.function_spaces[0].dofmaps(0)  # Single form case
-        return dolfinx.la.petsc.create_vector(dofmap.index_map, dofmap.index_map_bs)
-    except AttributeError:
-        maps = [
-            (
-                form.function_spaces[0].dofmaps(0).index_map,
-                form.function_spaces[0].dofmaps(0).index_map_bs,
-            )
-            for form in L
-        ]
-        if kind == PETSc.Vec.Type.NEST:
-            return _cpp.fem.petsc.create_vector_nest(maps)
-        elif kind == PETSc.Vec.Type.MPI:
-            off_owned = tuple(
-                itertools.accumulate(maps, lambda off, m: off + m[0].size_local * m[1], initial=0)
-            )
-            off_ghost = tuple(
-                itertools.accumulate(
-                    maps, lambda off, m: off + m[0].num_ghosts * m[1], initial=off_owned[-1]
-                )
-            )
+    if isinstance(L, Form):  # Single form
+        return dolfinx.la.petsc.create_vector(*_index_map_and_bs(L.function_spaces[0]))
 
-            b = _cpp.fem.petsc.create_vector_block(maps)
-            b.setAttr("_blocks", (off_owned, off_ghost))
-            return b
-        else:
-            raise NotImplementedError(
-                "Vector type must be specified for blocked/nested assembly."
-                f"Vector type '{kind}' not supported."
-                "Did you mean 'nest' or 'mpi'?"
-            )
+    maps = [_index_map_and_bs(form.function_spaces[0]) for form in L]
+    if kind == PETSc.Vec.Type.NEST:
+        return _cpp.fem.petsc.create_vector_nest(maps)
+    elif kind == PETSc.Vec.Type.MPI:
+        b = _cpp.fem.petsc.create_vector_block(maps)
+        b.setAttr("_blocks", _block_offsets(maps))
+        return b
+    else:
+        raise NotImplementedError(
+            "Vector type must be specified for blocked/nested assembly."
+            f"Vector type '{kind}' not supported."
+            "Did you mean 'nest' or 'mpi'?"
+        )
 
 
 # -- Matrix instantiation -------------------------------------------------
@@ -230,17 +242,18 @@ def create_matrix(
     Returns:
         A PETSc matrix.
     """
-    try:
-        return _cpp.fem.petsc.create_matrix(a._cpp_object, kind)  # Single form
-    except AttributeError:  # ``a`` is a nested sequence
-        _a = [[None if form is None else form._cpp_object for form in arow] for arow in a]
-        if kind == PETSc.Mat.Type.NEST:  # Create nest matrix with default types
-            return _cpp.fem.petsc.create_matrix_nest(_a, None)
-        else:
-            try:
-                return _cpp.fem.petsc.create_matrix_block(_a, kind)  # Single 'kind' type
-            except TypeError:
-                return _cpp.fem.petsc.create_matrix_nest(_a, kind)  # Array of 'kind' types
+    if isinstance(a, Form):  # Single form
+        return _cpp.fem.petsc.create_matrix(a._cpp_object, kind)
+
+    # ``a`` is a nested sequence
+    _a = [[None if form is None else form._cpp_object for form in arow] for arow in a]
+    if kind == PETSc.Mat.Type.NEST:  # Create nest matrix with default types
+        return _cpp.fem.petsc.create_matrix_nest(_a, None)
+    else:
+        try:
+            return _cpp.fem.petsc.create_matrix_block(_a, kind)  # Single 'kind' type
+        except TypeError:
+            return _cpp.fem.petsc.create_matrix_nest(_a, kind)  # Array of 'kind' types
 
 
 # -- Vector assembly ------------------------------------------------------
@@ -313,7 +326,7 @@ def assemble_vector(
     else:
         with b.localForm() as b_local:
             b_local.set(0)
-    return assemble_vector(b, L, constants, coeffs)
+    return _assemble_vector_vec(b, L, constants, coeffs)
 
 
 @assemble_vector.register(PETSc.Vec)
@@ -365,18 +378,22 @@ def _assemble_vector_vec(
             with b_sub.localForm() as b_local:
                 _assemble_vector_array(b_local.array_w, L_sub, const, coeff)
     elif isinstance(L, Iterable):
+        # Get the block offsets first so that a vector without block
+        # data fails before any data is packed
+        offset0, offset1 = b.getAttr("_blocks")
         constants = pack_constants(L) if constants is None else constants
         coeffs = pack_coefficients(L) if coeffs is None else coeffs
-        offset0, offset1 = b.getAttr("_blocks")
         with b.localForm() as b_l:
+            b_array = b_l.array_w  # Single view of the local array
             for L_, const, coeff, off0, off1, offg0, offg1 in zip(
                 L, constants, coeffs, offset0, offset0[1:], offset1, offset1[1:]
             ):
                 bx_ = np.zeros((off1 - off0) + (offg1 - offg0), dtype=PETSc.ScalarType)
                 _assemble_vector_array(bx_, L_, const, coeff)
                 size = off1 - off0
-                b_l.array_w[off0:off1] += bx_[:size]
-                b_l.array_w[offg0:offg1] += bx_[size:]
+                b_array[off0:off1] += bx_[:size]
+                b_array[offg0:offg1] += bx_[size:]
+            del b_array  # Restore the array before the local form
     else:
         with b.localForm() as b_local:
             _assemble_vector_array(b_local.array_w, L, constants, coeffs)
@@ -454,7 +471,7 @@ def assemble_matrix(
         A = _cpp.fem.petsc.create_matrix(a._cpp_object, kind)
     except AttributeError:
         A = create_matrix(a, kind)
-    assemble_matrix(A, a, bcs, diag, constants, coeffs)
+    assemble_matrix_mat(A, a, bcs, diag, constants, coeffs)
     return A
 
 
@@ -469,15 +486,25 @@ def _assemble_matrix_block_mat(
     """Assemble bilinear forms into a blocked matrix."""
     consts = [pack_constants(forms) for forms in a] if constants is None else constants
     coeffs = [pack_coefficients(forms) for forms in a] if coeffs is None else coeffs
+
+    # The index sets depend only on the block spaces. They are cached on
+    # A together with the spaces, and re-used while the spaces are the
+    # same objects.
     V = _extract_function_spaces(a)
-    is0 = _cpp.la.petsc.create_index_sets(
-        [(Vsub.dofmaps(0).index_map, Vsub.dofmaps(0).index_map_bs) for Vsub in V[0]]
-    )
-    is1 = _cpp.la.petsc.create_index_sets(
-        [(Vsub.dofmaps(0).index_map, Vsub.dofmaps(0).index_map_bs) for Vsub in V[1]]
-    )
+    cached = A.getAttr("_index_sets")
+    if cached is not None and all(
+        len(V_cached) == len(V_new) and all(u is w for u, w in zip(V_cached, V_new))
+        for V_cached, V_new in zip(cached[0], V)
+    ):
+        is0, is1 = cached[1]
+    else:
+        is0, is1 = (
+            _cpp.la.petsc.create_index_sets([_index_map_and_bs(Vsub) for Vsub in Vs]) for Vs in V
+        )
+        A.setAttr("_index_sets", (V, (is0, is1)))
 
     _bcs = [bc._cpp_object for bc in bcs] if bcs is not None else []
+    diag_blocks = []  # Blocks with the same test and trial space
     for i, a_row in enumerate(a):
         for j, a_sub in enumerate(a_row):
             if a_sub is not None:
@@ -486,11 +513,15 @@ def _assemble_matrix_block_mat(
                     Asub, a_sub._cpp_object, consts[i][j], coeffs[i][j], _bcs, True
                 )
                 A.restoreLocalSubMatrix(is0[i], is1[j], Asub)
-            elif i == j:
+                V0, V1 = a_sub.function_spaces
+                if V0 is V1:
+                    diag_blocks.append((i, j, V0))
+            elif i == j and _bcs:
+                row_forms = [row_form for row_form in a_row if row_form is not None]
+                assert len(row_forms) > 0
+                V0 = row_forms[0].function_spaces[0]
                 for bc in _bcs:
-                    row_forms = [row_form for row_form in a_row if row_form is not None]
-                    assert len(row_forms) > 0
-                    if row_forms[0].function_spaces[0].contains(bc.function_space):
+                    if V0.contains(bc.function_space):
                         raise RuntimeError(
                             f"Diagonal sub-block ({i}, {j}) cannot be 'None' "
                             " and have DirichletBC applied."
@@ -501,13 +532,10 @@ def _assemble_matrix_block_mat(
     A.assemble(PETSc.Mat.AssemblyType.FLUSH)
 
     # Set diagonal
-    for i, a_row in enumerate(a):
-        for j, a_sub in enumerate(a_row):
-            if a_sub is not None:
-                Asub = A.getLocalSubMatrix(is0[i], is1[j])
-                if a_sub.function_spaces[0] is a_sub.function_spaces[1]:
-                    _cpp.fem.petsc.insert_diagonal(Asub, a_sub.function_spaces[0], _bcs, diag)
-                A.restoreLocalSubMatrix(is0[i], is1[j], Asub)
+    for i, j, V in diag_blocks:
+        Asub = A.getLocalSubMatrix(is0[i], is1[j])
+        _cpp.fem.petsc.insert_diagonal(Asub, V, _bcs, diag)
+        A.restoreLocalSubMatrix(is0[i], is1[j], Asub)
 
     return A
 
@@ -538,16 +566,17 @@ def assemble_matrix_mat(
     if A.getType() == PETSc.Mat.Type.NEST:
         constants = [pack_constants(forms) for forms in a] if constants is None else constants
         coeffs = [pack_coefficients(forms) for forms in a] if coeffs is None else coeffs
-        for i, (a_row, const_row, coeff_row) in enumerate(zip(a, constants, coeffs)):
-            for j, (a_block, const, coeff) in enumerate(zip(a_row, const_row, coeff_row)):
+        for i, a_row in enumerate(a):
+            for j, a_block in enumerate(a_row):
                 if a_block is not None:
                     Asub = A.getNestSubMatrix(i, j)
-                    assemble_matrix(Asub, a_block, bcs, diag, const, coeff)
-                elif i == j:
+                    assemble_matrix_mat(Asub, a_block, bcs, diag, constants[i][j], coeffs[i][j])
+                elif i == j and bcs:
+                    row_forms = [row_form for row_form in a_row if row_form is not None]
+                    assert len(row_forms) > 0
+                    V0 = row_forms[0].function_spaces[0]
                     for bc in bcs:
-                        row_forms = [row_form for row_form in a_row if row_form is not None]
-                        assert len(row_forms) > 0
-                        if row_forms[0].function_spaces[0].contains(bc.function_space):
+                        if V0.contains(bc.function_space):
                             raise RuntimeError(
                                 f"Diagonal sub-block ({i}, {j}) cannot be 'None'"
                                 " and have DirichletBC applied."
@@ -560,10 +589,13 @@ def assemble_matrix_mat(
         coeffs = pack_coefficients(a) if coeffs is None else coeffs
         _bcs = [bc._cpp_object for bc in bcs] if bcs is not None else []
         _cpp.fem.petsc.assemble_matrix(A, a._cpp_object, constants, coeffs, _bcs)
-        if a.function_spaces[0] is a.function_spaces[1]:
+        V0 = a.function_spaces[0]
+        # Flushing is collective, so only do it if a diagonal entry will
+        # be inserted
+        if V0 is a.function_spaces[1] and any(V0.contains(bc.function_space) for bc in _bcs):
             A.assemblyBegin(PETSc.Mat.AssemblyType.FLUSH)
             A.assemblyEnd(PETSc.Mat.AssemblyType.FLUSH)
-            _cpp.fem.petsc.insert_diagonal(A, a.function_spaces[0], _bcs, diag)
+            _cpp.fem.petsc.insert_diagonal(A, V0, _bcs, diag)
 
     return A
 
@@ -642,9 +674,7 @@ def apply_lifting(
         constants = [pack_constants(forms) for forms in a] if constants is None else constants
         coeffs = [pack_coefficients(forms) for forms in a] if coeffs is None else coeffs
         for b_sub, a_sub, const, coeff in zip(b.getNestSubVecs(), a, constants, coeffs):
-            const_ = list(
-                map(lambda x: np.array([], dtype=PETSc.ScalarType) if x is None else x, const)
-            )
+            const_ = [_empty_constants if val is None else val for val in const]
             apply_lifting(b_sub, a_sub, bcs, x0, alpha, const_, coeff)
     else:
         with contextlib.ExitStack() as stack:
@@ -667,20 +697,25 @@ def apply_lifting(
                     pass
                 offset0, offset1 = b.getAttr("_blocks")
                 with b.localForm() as b_l:
+                    b_array = b_l.array_w  # Single view of the local array
                     for i, (a_, off0, off1, offg0, offg1) in enumerate(
                         zip(a, offset0, offset0[1:], offset1, offset1[1:])
                     ):
+                        # Skip rows where no form has a boundary
+                        # condition applied to its trial space
+                        if len(a_) == len(bcs) and all(
+                            form is None or not bc for form, bc in zip(a_, bcs)
+                        ):
+                            continue
                         const = pack_constants(a_) if constants is None else constants[i]
                         coeff = pack_coefficients(a_) if coeffs is None else coeffs[i]
-                        const_ = [
-                            np.empty(0, dtype=PETSc.ScalarType) if val is None else val
-                            for val in const
-                        ]
-                        bx_ = np.concatenate((b_l[off0:off1], b_l[offg0:offg1]))
+                        const_ = [_empty_constants if val is None else val for val in const]
+                        bx_ = np.concatenate((b_array[off0:off1], b_array[offg0:offg1]))
                         _apply_lifting(bx_, a_, bcs, xlocal, float(alpha), const_, coeff)
                         size = off1 - off0
-                        b_l.array_w[off0:off1] = bx_[:size]
-                        b_l.array_w[offg0:offg1] = bx_[size:]
+                        b_array[off0:off1] = bx_[:size]
+                        b_array[offg0:offg1] = bx_[size:]
+                    del b_array  # Restore the array before the local form
             else:
                 try:
                     bcs = _bcs_by_block(_extract_spaces([a], 1), bcs)
@@ -734,13 +769,17 @@ def set_bc(
             b_array = b.getArray(readonly=False)
             x_array = x0.getArray(readonly=True) if x0 is not None else None
             for bcs, off0, off1 in zip(bcs, offset0, offset0[1:]):
+                if not bcs:
+                    continue
+                b_sub = b_array[off0:off1]
                 x0_sub = x_array[off0:off1] if x0 is not None else None
                 for bc in bcs:
-                    bc.set(b_array[off0:off1], x0_sub, alpha)
+                    bc.set(b_sub, x0_sub, alpha)
         except TypeError:
+            b_array = b.array_w
             x0 = x0.array_r if x0 is not None else None
             for bc in bcs:
-                bc.set(b.array_w, x0, alpha)
+                bc.set(b_array, x0, alpha)
 
 
 # -- High-level interface for KSP ---------------------------------------
@@ -925,46 +964,61 @@ class LinearProblem:
             The solution, convergence reason and number of KSP iterations.
         """
 
+        # Pack the constants and coefficients of the bilinear form(s)
+        # once for use in both the matrix assembly and the lifting
+        constants_a = pack_constants(self.a)
+        coeffs_a = pack_coefficients(self.a)
+
         # Assemble lhs
         self.A.zeroEntries()
-        assemble_matrix(self.A, self.a, bcs=self.bcs)
+        assemble_matrix_mat(self.A, self.a, bcs=self.bcs, constants=constants_a, coeffs=coeffs_a)
         self.A.assemble()
 
         # Assemble preconditioner
         if self.P_mat is not None:
             self.P_mat.zeroEntries()
-            assemble_matrix(self.P_mat, self.preconditioner, bcs=self.bcs)
+            assemble_matrix_mat(self.P_mat, self.preconditioner, bcs=self.bcs)
             self.P_mat.assemble()
 
-        # Assemble rhs
-        if self.b.getType() == PETSc.Vec.Type.NEST:
-            for b_sub in self.b.getNestSubVecs():
-                with b_sub.localForm() as b_local:
-                    b_local.set(0.0)
+        # Assemble rhs and apply boundary conditions to the rhs
+        if isinstance(self.L, Form):
+            # Zero, assemble and lift using a single local (ghosted)
+            # form of the vector
+            with self.b.localForm() as b_local:
+                b_local.set(0)
+                _assemble_vector_array(b_local.array_w, self.L)
+                if self.bcs is not None:
+                    _apply_lifting(
+                        b_local.array_w,
+                        [self.a],
+                        [self.bcs],
+                        constants=[constants_a],
+                        coeffs=[coeffs_a],
+                    )
+            dolfinx.la.petsc._ghost_update(self.b, PETSc.InsertMode.ADD, PETSc.ScatterMode.REVERSE)
+            if self.bcs is not None:
+                set_bc(self.b, self.bcs)
         else:
-            with self.b.localForm() as b_loc:
-                b_loc.set(0)
-        assemble_vector(self.b, self.L)
-
-        # Apply boundary conditions to the rhs
-        if self.bcs is not None:
-            try:
-                apply_lifting(self.b, [self.a], bcs=[self.bcs])
+            if self.b.getType() == PETSc.Vec.Type.NEST:
+                for b_sub in self.b.getNestSubVecs():
+                    with b_sub.localForm() as b_local:
+                        b_local.set(0.0)
+            else:
+                with self.b.localForm() as b_loc:
+                    b_loc.set(0)
+            _assemble_vector_vec(self.b, self.L)
+            if self.bcs is not None:
+                bcs1 = _bcs_by_block(_extract_spaces(self.a, 1), self.bcs)  # type: ignore
+                apply_lifting(self.b, self.a, bcs=bcs1, constants=constants_a, coeffs=coeffs_a)  # type: ignore
                 dolfinx.la.petsc._ghost_update(
                     self.b, PETSc.InsertMode.ADD, PETSc.ScatterMode.REVERSE
                 )
-                for bc in self.bcs:
-                    bc.set(self.b.array_w)
-            except RuntimeError:
-                bcs1 = _bcs_by_block(_extract_spaces(self.a, 1), self.bcs)  # type: ignore
-                apply_lifting(self.b, self.a, bcs=bcs1)  # type: ignore
+                bcs0 = _bcs_by_block(_extract_spaces(self.L), self.bcs)  # type: ignore
+                set_bc(self.b, bcs0)
+            else:
                 dolfinx.la.petsc._ghost_update(
                     self.b, PETSc.InsertMode.ADD, PETSc.ScatterMode.REVERSE
                 )
-                bcs0 = _bcs_by_block(_extract_spaces(self.L), self.bcs)  # type: ignore
-                dolfinx.fem.petsc.set_bc(self.b, bcs0)
-        else:
-            dolfinx.la.petsc._ghost_update(self.b, PETSc.InsertMode.ADD, PETSc.ScatterMode.REVERSE)
 
         # Solve linear system and update ghost values in the solution
         self.solver.solve(self.b, self.x)
@@ -1081,22 +1135,8 @@ def _assign_block_data(forms: typing.Iterable[dolfinx.fem.Form], vec: PETSc.Vec)
     if vec.getAttr("_blocks") is not None or vec.getType() == "nest":
         return
 
-    maps = [
-        (
-            form.function_spaces[0].dofmaps(0).index_map,
-            form.function_spaces[0].dofmaps(0).index_map_bs,
-        )
-        for form in forms  # type: ignore
-    ]
-    off_owned = tuple(
-        itertools.accumulate(maps, lambda off, m: off + m[0].size_local * m[1], initial=0)
-    )
-    off_ghost = tuple(
-        itertools.accumulate(
-            maps, lambda off, m: off + m[0].num_ghosts * m[1], initial=off_owned[-1]
-        )
-    )
-    vec.setAttr("_blocks", (off_owned, off_ghost))
+    maps = [_index_map_and_bs(form.function_spaces[0]) for form in forms]  # type: ignore
+    vec.setAttr("_blocks", _block_offsets(maps))
 
 
 def assemble_residual(
@@ -1136,11 +1176,11 @@ def assemble_residual(
     _zero_vector(b)
     try:
         # Single form and nest assembly
-        assemble_vector(b, residual)
+        _assemble_vector_vec(b, residual)
     except TypeError:
         # Block assembly
         _assign_block_data(residual, b)  # type: ignore
-        assemble_vector(b, residual)  # type: ignore
+        _assemble_vector_vec(b, residual)  # type: ignore
 
     # Lift vector
     try:
@@ -1200,11 +1240,11 @@ def assemble_jacobian(
 
     # Assemble Jacobian
     J.zeroEntries()
-    assemble_matrix(J, jacobian, bcs, diag=1.0)  # type: ignore
+    assemble_matrix_mat(J, jacobian, bcs, diag=1.0)  # type: ignore
     J.assemble()
     if preconditioner is not None:
         P.zeroEntries()
-        assemble_matrix(P, preconditioner, bcs, diag=1.0)  # type: ignore
+        assemble_matrix_mat(P, preconditioner, bcs, diag=1.0)  # type: ignore
         P.assemble()
 
 
@@ -1548,9 +1588,11 @@ class NewtonSolverNonlinearProblem:
             du = ufl.TrialFunction(V)
             J = ufl.derivative(F, u, du)
 
-        self._a = _create_form(
-            J, form_compiler_options=form_compiler_options, jit_options=jit_options
-        )
+        # The Jacobian form is compiled on first use
+        self._J_ufl = J
+        self._form_compiler_options = form_compiler_options
+        self._jit_options = jit_options
+        self._a: typing.Optional[Form] = None
         self.bcs = bcs
 
     @property
@@ -1561,6 +1603,12 @@ class NewtonSolverNonlinearProblem:
     @property
     def a(self) -> Form:
         """The compiled bilinear form (the Jacobian form)."""
+        if self._a is None:
+            self._a = _create_form(
+                self._J_ufl,
+                form_compiler_options=self._form_compiler_options,
+                jit_options=self._jit_options,
+            )
         return self._a
 
     def form(self, x: PETSc.Vec) -> None:
@@ -1579,18 +1627,21 @@ class NewtonSolverNonlinearProblem:
             x: The vector containing the latest solution
             b: Vector to assemble the residual into
         """
-        # Reset the residual vector
+        # Reset the residual vector, assemble and apply lifting on the
+        # local array in one pass
         with b.localForm() as b_local:
             b_local.set(0.0)
-        assemble_vector(b, self._L)
+            b_array = b_local.array_w
+            _assemble_vector_array(b_array, self._L)
+            if self.bcs is not None:
+                with x.localForm() as x_local:
+                    _apply_lifting(b_array, [self.a], [self.bcs], [x_local.array_r], -1.0)
+            del b_array  # Restore the array before the local form
 
         # Apply boundary condition
+        b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
         if self.bcs is not None:
-            apply_lifting(b, [self._a], bcs=[self.bcs], x0=[x], alpha=-1.0)
-            b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
             set_bc(b, self.bcs, x, -1.0)
-        else:
-            b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
 
     def J(self, x: PETSc.Vec, A: PETSc.Mat) -> None:
         """Assemble the Jacobian matrix.
@@ -1599,7 +1650,7 @@ class NewtonSolverNonlinearProblem:
             x: The vector containing the latest solution
         """
         A.zeroEntries()
-        assemble_matrix(A, self._a, self.bcs)
+        assemble_matrix_mat(A, self.a, self.bcs)
         A.assemble()
 
 
@@ -1659,6 +1710,23 @@ def interpolation_matrix(V0: _FunctionSpace, V1: _FunctionSpace) -> PETSc.Mat:
     return _interpolation_matrix(V0._cpp_object, V1._cpp_object)
 
 
+def _owned_and_ghost_arrays(u: Sequence[_Function]) -> list[npt.NDArray]:
+    """Get views into the owned and ghost degree-of-freedom values of
+    each ``Function`` in ``u``.
+
+    The views are ordered ``[u0_owned, u1_owned, ..., u0_ghost,
+    u1_ghost, ...]``.
+    """
+    n = len(u)
+    data: list = [None] * (2 * n)
+    for i, v in enumerate(u):
+        dofmap = v.function_space.dofmap
+        split = dofmap.bs * dofmap.index_map.size_local
+        array = v.x.array
+        data[i], data[n + i] = array[:split], array[split:]
+    return data
+
+
 @functools.singledispatch
 def assign(u: typing.Union[_Function, Sequence[_Function]], x: PETSc.Vec):
     """Assign :class:`Function` degrees-of-freedom to a vector.
@@ -1676,16 +1744,10 @@ def assign(u: typing.Union[_Function, Sequence[_Function]], x: PETSc.Vec):
     if x.getType() == PETSc.Vec.Type().NEST:
         dolfinx.la.petsc.assign([v.x.array for v in u], x)
     else:
-        if isinstance(u, Sequence):
-            data0, data1 = [], []
-            for v in u:
-                bs = v.function_space.dofmap.bs
-                n = v.function_space.dofmap.index_map.size_local
-                data0.append(v.x.array[: bs * n])
-                data1.append(v.x.array[bs * n :])
-            dolfinx.la.petsc.assign(data0 + data1, x)
-        else:
+        if isinstance(u, _Function):
             dolfinx.la.petsc.assign(u.x.array, x)
+        else:
+            dolfinx.la.petsc.assign(_owned_and_ghost_arrays(u), x)
 
 
 @assign.register(PETSc.Vec)
@@ -1705,13 +1767,7 @@ def _(x: PETSc.Vec, u: typing.Union[_Function, Sequence[_Function]]):
     if x.getType() == PETSc.Vec.Type().NEST:
         dolfinx.la.petsc.assign(x, [v.x.array for v in u])
     else:
-        if isinstance(u, Sequence):
-            data0, data1 = [], []
-            for v in u:
-                bs = v.function_space.dofmap.bs
-                n = v.function_space.dofmap.index_map.size_local
-                data0.append(v.x.array[: bs * n])
-                data1.append(v.x.array[bs * n :])
-            dolfinx.la.petsc.assign(x, data0 + data1)
-        else:
+        if isinstance(u, _Function):
             dolfinx.la.petsc.assign(x, u.x.array)
+        else:
+            dolfinx.la.petsc.assign(x, _owned_and_ghost_arrays(u))
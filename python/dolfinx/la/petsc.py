@@ -106,14 +106,16 @@ def assign(x0: typing.Union[npt.NDArray[np.inexact], list[npt.NDArray[np.inexact
                 x.array_w[:] = _x0
     except PETSc.Error:  # type: ignore[attr-defined]
         with x1.localForm() as _x:
+            array = _x.array_w
             try:
                 start = 0
                 for _x0 in x0:
                     end = start + _x0.shape[0]
-                    _x.array_w[start:end] = _x0
+                    array[start:end] = _x0
                     start = end
             except IndexError:
-                _x.array_w[:] = x0
+                array[:] = x0
+            del array  # Restore the array before the local form
 
 
 @assign.register(PETSc.Vec)  # type: ignore[attr-defined]
@@ -136,11 +138,13 @@ def _(x0: PETSc.Vec, x1: typing.Union[npt.NDArray[np.inexact], list[npt.NDArray[
                 _x1[:] = x.array_r[:]  # type: ignore
     except PETSc.Error:  # type: ignore[attr-defined]
         with x0.localForm() as _x0:
+            array = _x0.array_r
             try:
                 start = 0
                 for _x1 in x1:
                     end = start + _x1.shape[0]
-                    _x1[:] = _x0.array_r[start:end]
+                    _x1[:] = array[start:end]
                     start = end
             except IndexError:
-                x1[:] = _x0.array_r[:]
+                x1[:] = array
+            del array  # Restore the array before the local form
@@ -12,7 +12,7 @@ import pytest
 
 import ufl
 from dolfinx import default_real_type
-from dolfinx.fem import Function, dirichletbc, form, functionspace, locate_dofs_geometrical
+from dolfinx.fem import Form, Function, dirichletbc, form, functionspace, locate_dofs_geometrical
 from dolfinx.mesh import create_unit_square
 from ufl import TestFunction, TrialFunction, derivative, dx, grad, inner
 
@@ -196,6 +196,45 @@ class TestNLS:
         assert converged
         assert n > 0 and n < 6
 
+    def test_jacobian_compiled_on_first_use(self, monkeypatch):
+        """Test that the Jacobian form of a Newton problem is compiled
+        only when it is first used"""
+        import dolfinx.fem.petsc
+        from dolfinx.fem.petsc import NewtonSolverNonlinearProblem, create_vector
+
+        # Count the forms compiled by the Newton problem
+        compiled = []
+        create_form = dolfinx.fem.petsc._create_form
+
+        def counting_create_form(*args, **kwargs):
+            compiled.append(args[0])
+            return create_form(*args, **kwargs)
+
+        monkeypatch.setattr(dolfinx.fem.petsc, "_create_form", counting_create_form)
+
+        mesh = create_unit_square(MPI.COMM_WORLD, 8, 8)
+        V = functionspace(mesh, ("Lagrange", 1))
+        u = Function(V)
+        v = TestFunction(V)
+        F = inner(5.0, v) * dx - ufl.sqrt(u * u) * inner(grad(u), grad(v)) * dx - inner(u, v) * dx
+        problem = NewtonSolverNonlinearProblem(F, u)
+        assert len(compiled) == 1 and compiled[0] is F
+
+        # Evaluating the residual without bcs does not compile the
+        # Jacobian
+        b = create_vector(problem.L)
+        problem.form(u.x.petsc_vec)
+        problem.F(u.x.petsc_vec, b)
+        assert len(compiled) == 1
+
+        # The Jacobian is compiled on first access and then re-used
+        a = problem.a
+        assert isinstance(a, Form)
+        assert len(compiled) == 2
+        assert problem.a is a
+        assert len(compiled) == 2
+        b.destroy()
+
     def test_nonlinear_pde_snes(self):
         """Test Newton solver for a simple nonlinear PDE"""
         from petsc4py import PETSc